@@ -1,17 +1,88 @@
 """Command-line Battleship game against a computer opponent."""
 from __future__ import annotations
 
+import multiprocessing as mp
+import queue
 import random
 import string
+import sys
+import threading
+from collections import Counter, deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Sequence, Set, Tuple
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
 
-Coordinate = Tuple[int, int]
+# Cells are packed into a single int, ``row * BOARD_SIZE + col``, so that the
+# many set and dict lookups keyed on them hash a plain int rather than a tuple.
+Coordinate = int
 
 
 BOARD_SIZE = 10
 COLUMNS = string.ascii_uppercase[:BOARD_SIZE]
 ROWS = [str(i) for i in range(1, BOARD_SIZE + 1)]
+_COL_MAP = {char: idx for idx, char in enumerate(COLUMNS)}
+_ROW_MAP = {label: idx for idx, label in enumerate(ROWS)}
+HEADER = "   " + " ".join(COLUMNS)
+ROW_LABELS = [f"{label:>2} " for label in ROWS]
+
+# Cell states stored in ``Board.grid``; the translation tables map them to
+# their rendered glyphs, optionally hiding ships as open water.
+WATER, SHIP, MISS, HIT = range(4)
+_GLYPHS = bytes.maketrans(bytes([WATER, SHIP, MISS, HIT]), b"~SoX")
+_HIDE_SHIPS = bytes.maketrans(bytes([SHIP]), bytes([WATER]))
+
+
+def encode(row: int, col: int) -> Coordinate:
+    return row * BOARD_SIZE + col
+
+
+def decode(coord: Coordinate) -> Tuple[int, int]:
+    return divmod(coord, BOARD_SIZE)
+
+
+# In-bounds orthogonal neighbours of every cell, indexed by coordinate.
+NEIGHBORS: Tuple[Tuple[Coordinate, ...], ...] = tuple(
+    tuple(
+        encode(row + delta_row, col + delta_col)
+        for delta_row, delta_col in ((-1, 0), (1, 0), (0, -1), (0, 1))
+        if 0 <= row + delta_row < BOARD_SIZE and 0 <= col + delta_col < BOARD_SIZE
+    )
+    for row in range(BOARD_SIZE)
+    for col in range(BOARD_SIZE)
+)
+
+
+@lru_cache(maxsize=None)
+def ship_placements(length: int) -> Tuple[Tuple[Coordinate, ...], ...]:
+    """Every in-bounds horizontal and vertical footprint of a ship of ``length``."""
+    placements = []
+    for row in range(BOARD_SIZE):
+        for col in range(BOARD_SIZE - length + 1):
+            placements.append(tuple(encode(row, col + offset) for offset in range(length)))
+    for row in range(BOARD_SIZE - length + 1):
+        for col in range(BOARD_SIZE):
+            placements.append(tuple(encode(row + offset, col) for offset in range(length)))
+    return tuple(placements)
+
+
+@lru_cache(maxsize=None)
+def _placement_masks(length: int) -> Tuple[Tuple[int, Tuple[Coordinate, ...]], ...]:
+    return tuple((sum(1 << coord for coord in cells), cells) for cells in ship_placements(length))
+
+
+def placement_density(blocked: int, ship_lengths: Sequence[int]) -> List[int]:
+    """Count, per cell, the ship placements covering it that avoid ``blocked``.
+
+    ``blocked`` is a bitmask with bit ``coord`` set for every cell no ship can
+    occupy. Ships of equal length share one pass over their placements.
+    """
+    density = [0] * (BOARD_SIZE * BOARD_SIZE)
+    for length, count in Counter(ship_lengths).items():
+        for mask, cells in _placement_masks(length):
+            if not mask & blocked:
+                for coord in cells:
+                    density[coord] += count
+    return density
 
 
 @dataclass
@@ -20,74 +91,107 @@ class Ship:
     length: int
     coordinates: List[Coordinate] = field(default_factory=list)
     hits: Set[Coordinate] = field(default_factory=set)
+    horizontal: bool = True
+    remaining_cells: int = field(init=False)
+    coord_set: FrozenSet[Coordinate] = field(default=frozenset(), init=False)
+    mask: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        self.remaining_cells = self.length
 
     def place(self, start: Coordinate, horizontal: bool) -> None:
-        row, col = start
-        self.coordinates = [
-            (row, col + offset) if horizontal else (row + offset, col)
-            for offset in range(self.length)
-        ]
+        step = 1 if horizontal else BOARD_SIZE
+        self.horizontal = horizontal
+        self.coordinates = [start + offset * step for offset in range(self.length)]
+        self.coord_set = frozenset(self.coordinates)
+        self.mask = sum(1 << coord for coord in self.coordinates)
 
     @property
     def is_sunk(self) -> bool:
-        return set(self.coordinates) == self.hits
+        return self.remaining_cells == 0
 
     def register_hit(self, coord: Coordinate) -> None:
-        if coord in self.coordinates:
-            self.hits.add(coord)
+        """Record a first hit on one of this ship's cells; the Board guarantees both."""
+        self.hits.add(coord)
+        self.remaining_cells -= 1
+
+
+@dataclass
+class AttackResult:
+    hit: bool
+    sunk: Optional[Ship] = None
+    game_over: bool = False
 
 
 class Board:
     def __init__(self) -> None:
         self.ships: Dict[Coordinate, Ship] = {}
-        self.misses: Set[Coordinate] = set()
-        self.hits: Set[Coordinate] = set()
+        self.unique_ships: List[Ship] = []
+        # Bitboards over the 100 cells: bit ``coord`` is set when it applies.
+        self.ships_mask = 0
+        self.misses_mask = 0
+        self.hits_mask = 0
+        self.grid = bytearray(BOARD_SIZE * BOARD_SIZE)
+        self.ships_remaining = 0
 
     def place_ship(self, ship: Ship) -> bool:
-        for coord in ship.coordinates:
-            if not self._in_bounds(coord) or coord in self.ships:
-                return False
+        # divmod keeps the column in range, so only the row and the far end
+        # along the ship's orientation need checking.
+        row, col = decode(ship.coordinates[0])
+        lead = col if ship.horizontal else row
+        if not 0 <= row < BOARD_SIZE or lead + ship.length > BOARD_SIZE:
+            return False
+        if ship.mask & self.ships_mask:
+            return False
         for coord in ship.coordinates:
             self.ships[coord] = ship
+            self.grid[coord] = SHIP
+        self.ships_mask |= ship.mask
+        self.unique_ships.append(ship)
+        self.ships_remaining += 1
         return True
 
-    def receive_attack(self, coord: Coordinate) -> Tuple[bool, Optional[Ship]]:
-        if coord in self.hits or coord in self.misses:
+    def place_fleet_randomly(self, ships: Sequence[Tuple[str, int]]) -> None:
+        """Place each ship uniformly at random among the footprints still free."""
+        for name, length in ships:
+            _, cells = random.choice(
+                [placement for placement in _placement_masks(length) if not placement[0] & self.ships_mask]
+            )
+            ship = Ship(name, length)
+            ship.place(cells[0], horizontal=cells[1] - cells[0] == 1)
+            self.place_ship(ship)
+
+    def attack(self, coord: Coordinate) -> AttackResult:
+        """Resolve a shot, reporting any ship it sinks and whether the fleet is gone."""
+        bit = 1 << coord
+        if (self.hits_mask | self.misses_mask) & bit:
             raise ValueError("Coordinate has already been targeted.")
 
         ship = self.ships.get(coord)
-        if ship:
-            ship.register_hit(coord)
-            self.hits.add(coord)
-            return True, ship
-        self.misses.add(coord)
-        return False, None
-
-    @staticmethod
-    def _in_bounds(coord: Coordinate) -> bool:
-        row, col = coord
-        return 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE
+        if ship is None:
+            self.misses_mask |= bit
+            self.grid[coord] = MISS
+            return AttackResult(hit=False)
+
+        ship.register_hit(coord)
+        self.hits_mask |= bit
+        self.grid[coord] = HIT
+        if not ship.is_sunk:
+            return AttackResult(hit=True)
+        self.ships_remaining -= 1
+        return AttackResult(hit=True, sunk=ship, game_over=self.ships_remaining == 0)
 
     def has_lost(self) -> bool:
-        ships = set(self.ships.values())
-        return bool(ships) and all(ship.is_sunk for ship in ships)
+        return bool(self.ships_mask) and self.ships_remaining == 0
 
     def render(self, reveal_ships: bool = False) -> str:
-        grid = [["~" for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
-        for coord, ship in self.ships.items():
-            row, col = coord
-            if reveal_ships:
-                grid[row][col] = "S"
-        for row, col in self.misses:
-            grid[row][col] = "o"
-        for row, col in self.hits:
-            grid[row][col] = "X"
-
-        header = "   " + " ".join(COLUMNS)
-        lines = [header]
-        for idx, row_cells in enumerate(grid):
-            row_label = f"{idx + 1:>2}"
-            lines.append(f"{row_label} " + " ".join(row_cells))
+        cells = self.grid if reveal_ships else self.grid.translate(_HIDE_SHIPS)
+        glyphs = cells.translate(_GLYPHS).decode("ascii")
+        lines = [HEADER]
+        lines.extend(
+            ROW_LABELS[row] + " ".join(glyphs[row * BOARD_SIZE:(row + 1) * BOARD_SIZE])
+            for row in range(BOARD_SIZE)
+        )
         return "\n".join(lines)
 
 
@@ -102,13 +206,44 @@ class Player:
 
     @property
     def ships(self) -> Sequence[Ship]:
-        seen: Dict[str, Ship] = {}
-        for ship in self.board.ships.values():
-            seen.setdefault(ship.name, ship)
-        return list(seen.values())
+        return self.board.unique_ships
+
+    def prepare_turn(self, opponent: Player) -> None:
+        """Do work for this player's next turn while ``opponent`` is deciding theirs."""
+
+
+class InputReader:
+    """Reads stdin on a daemon thread so the game can keep working while the player types."""
+
+    def __init__(self) -> None:
+        self._lines: queue.Queue[Optional[str]] = queue.Queue()
+        threading.Thread(target=self._pump, daemon=True).start()
+
+    def _pump(self) -> None:
+        for line in iter(sys.stdin.readline, ""):
+            self._lines.put(line)
+        self._lines.put(None)
+
+    def readline(self, prompt: str, while_waiting: Optional[Callable[[], None]] = None) -> str:
+        print(prompt, end="", flush=True)
+        if while_waiting is not None:
+            while_waiting()
+        line = self._lines.get()
+        if line is None:
+            raise EOFError
+        return line.rstrip("\n")
 
 
 class HumanPlayer(Player):
+    def __init__(self, name: str, reader: Optional[InputReader] = None) -> None:
+        super().__init__(name)
+        self.reader = reader
+
+    def _prompt(self, prompt: str, while_waiting: Optional[Callable[[], None]] = None) -> str:
+        if self.reader is None:
+            return input(prompt)
+        return self.reader.readline(prompt, while_waiting)
+
     def place_ships(self, ships: Sequence[Tuple[str, int]]) -> None:
         print("It's time to deploy your fleet!")
         print("Enter coordinates in the form 'A5 H' for horizontal or 'C3 V' for vertical placement.")
@@ -117,7 +252,7 @@ class HumanPlayer(Player):
         for index, (name, length) in enumerate(ships):
             ship = Ship(name, length)
             while True:
-                user_input = input(f"Place your {name} (length {length}): ").strip().upper()
+                user_input = self._prompt(f"Place your {name} (length {length}): ").strip().upper()
                 if user_input == "RANDOM":
                     self._randomly_place_remaining(ships[index:])
                     return
@@ -141,22 +276,15 @@ class HumanPlayer(Player):
                 print("Ships cannot overlap or extend beyond the board. Try again.")
 
     def _randomly_place_remaining(self, ships: Sequence[Tuple[str, int]]) -> None:
-        remaining_ships = list(ships)
-        for name, length in remaining_ships:
-            placed = False
-            while not placed:
-                row = random.randrange(BOARD_SIZE)
-                col = random.randrange(BOARD_SIZE)
-                horizontal = random.choice([True, False])
-                ship = Ship(name, length)
-                ship.place((row, col), horizontal)
-                placed = self.board.place_ship(ship)
+        self.board.place_fleet_randomly(ships)
         print("Fleet deployed randomly:")
         print(self.board.render(reveal_ships=True))
 
-    def take_turn(self, opponent: Player) -> None:
+    def take_turn(self, opponent: Player, verbose: bool = True) -> AttackResult:
         while True:
-            target_input = input("Choose your target (e.g., E7): ").strip().upper()
+            target_input = self._prompt(
+                "Choose your target (e.g., E7): ", while_waiting=lambda: opponent.prepare_turn(self)
+            ).strip().upper()
             coord = parse_coordinate(target_input)
             if coord is None:
                 print("Invalid coordinate. Try again.")
@@ -164,66 +292,102 @@ class HumanPlayer(Player):
             if coord in self.shots_taken:
                 print("You already fired there. Choose another coordinate.")
                 continue
-            self.shots_taken.add(coord)
-            hit, ship = opponent.board.receive_attack(coord)
-            if hit:
-                print(f"Hit! {ship.name} was struck.")
-                if ship.is_sunk:
-                    print(f"You sank the enemy {ship.name}!")
+            break
+        self.shots_taken.add(coord)
+        result = opponent.board.attack(coord)
+        if verbose:
+            if result.hit:
+                print(f"Hit! {opponent.board.ships[coord].name} was struck.")
+                if result.sunk:
+                    print(f"You sank the enemy {result.sunk.name}!")
             else:
                 print("Miss.")
-            break
+        return result
 
 
 class ComputerPlayer(Player):
     def __init__(self, name: str = "Computer") -> None:
         super().__init__(name)
-        self.available_targets: Set[Coordinate] = {(r, c) for r in range(BOARD_SIZE) for c in range(BOARD_SIZE)}
-        self.target_queue: List[Coordinate] = []
+        # Unshot cells as a list for O(1) random picks, plus each cell's index
+        # in that list for O(1) membership tests and swap-and-pop removal.
+        self.available_targets: List[Coordinate] = list(range(BOARD_SIZE * BOARD_SIZE))
+        self._target_index: Dict[Coordinate, int] = {coord: idx for idx, coord in enumerate(self.available_targets)}
+        self.target_queue: deque[Coordinate] = deque()
+        # Bit ``coord`` is set for every known miss or sunk-ship cell.
+        self._blocked_mask = 0
+        self._pending_target: Optional[Coordinate] = None
 
     def place_ships(self, ships: Sequence[Tuple[str, int]]) -> None:
-        for name, length in ships:
-            placed = False
-            while not placed:
-                row = random.randrange(BOARD_SIZE)
-                col = random.randrange(BOARD_SIZE)
-                horizontal = random.choice([True, False])
-                ship = Ship(name, length)
-                ship.place((row, col), horizontal)
-                placed = self.board.place_ship(ship)
-
-    def take_turn(self, opponent: Player) -> None:
-        coord = self._select_target()
+        self.board.place_fleet_randomly(ships)
+
+    def take_turn(self, opponent: Player, verbose: bool = True) -> AttackResult:
+        coord = self._pending_target
+        if coord is None:
+            coord = self._select_target(opponent)
+        self._pending_target = None
         self.shots_taken.add(coord)
-        self.available_targets.remove(coord)
-        hit, ship = opponent.board.receive_attack(coord)
-        print(f"{self.name} fires at {format_coordinate(coord)}...")
-        if hit:
-            print("It's a hit!")
+        self._remove_target(coord)
+        result = opponent.board.attack(coord)
+        if verbose:
+            print(f"{self.name} fires at {format_coordinate(coord)}...")
+        if result.hit:
+            if verbose:
+                print("It's a hit!")
             self._enqueue_neighbors(coord)
-            if ship and ship.is_sunk:
-                print(f"{self.name} sunk your {ship.name}!")
-                self._clear_queue_for_sunk_ship(ship)
+            if result.sunk:
+                if verbose:
+                    print(f"{self.name} sunk your {result.sunk.name}!")
+                self._blocked_mask |= result.sunk.mask
+                self._clear_queue_for_sunk_ship(result.sunk)
         else:
-            print("It splashes into the sea.")
-
-    def _select_target(self) -> Coordinate:
+            self._blocked_mask |= 1 << coord
+            if verbose:
+                print("It splashes into the sea.")
+        return result
+
+    def prepare_turn(self, opponent: Player) -> None:
+        # The opponent's board only changes when this player fires, so a target
+        # chosen during their turn is still the best one when ours comes round.
+        if self._pending_target is None:
+            self._pending_target = self._select_target(opponent)
+
+    def _select_target(self, opponent: Player) -> Coordinate:
         while self.target_queue:
-            coord = self.target_queue.pop(0)
-            if coord in self.available_targets:
+            coord = self.target_queue.popleft()
+            if coord in self._target_index:
                 return coord
-        return random.choice(tuple(self.available_targets))
+
+        density = self._compute_probability_map(opponent)
+        best_score = max(density[coord] for coord in self.available_targets)
+        if best_score == 0:
+            return self.available_targets[random.randrange(len(self.available_targets))]
+        best = [coord for coord in self.available_targets if density[coord] == best_score]
+        return random.choice(best)
+
+    def _compute_probability_map(self, opponent: Player) -> List[int]:
+        """Count, per cell, the placements of each afloat enemy ship covering it.
+
+        A placement is ruled out when it crosses a known miss or a cell of a
+        ship that has already been sunk; the densest unshot cell is the most
+        likely to hide part of the remaining fleet.
+        """
+        afloat = [ship.length for ship in opponent.ships if not ship.is_sunk]
+        return placement_density(self._blocked_mask, afloat)
+
+    def _remove_target(self, coord: Coordinate) -> None:
+        idx = self._target_index.pop(coord)
+        last = self.available_targets.pop()
+        if idx < len(self.available_targets):
+            self.available_targets[idx] = last
+            self._target_index[last] = idx
 
     def _enqueue_neighbors(self, coord: Coordinate) -> None:
-        row, col = coord
-        for delta_row, delta_col in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            neighbor = (row + delta_row, col + delta_col)
-            if neighbor in self.available_targets and Board._in_bounds(neighbor):
+        for neighbor in NEIGHBORS[coord]:
+            if neighbor in self._target_index:
                 self.target_queue.append(neighbor)
 
     def _clear_queue_for_sunk_ship(self, ship: Ship) -> None:
-        ship_coords = set(ship.coordinates)
-        self.target_queue = [coord for coord in self.target_queue if coord not in ship_coords]
+        self.target_queue = deque(coord for coord in self.target_queue if coord not in ship.coord_set)
 
 
 FLEET: Sequence[Tuple[str, int]] = [
@@ -234,26 +398,28 @@ FLEET: Sequence[Tuple[str, int]] = [
     ("Destroyer", 2),
 ]
 
+# Build the placement tables up front rather than on the computer's first shot.
+for _, _length in FLEET:
+    _placement_masks(_length)
+
 
 def parse_coordinate(text: str) -> Optional[Coordinate]:
     if len(text) < 2:
         return None
-    column_char = text[0]
-    row_part = text[1:]
-    if column_char not in COLUMNS or row_part not in ROWS:
+    col = _COL_MAP.get(text[0])
+    row = _ROW_MAP.get(text[1:])
+    if col is None or row is None:
         return None
-    row = int(row_part) - 1
-    col = COLUMNS.index(column_char)
-    return row, col
+    return encode(row, col)
 
 
 def format_coordinate(coord: Coordinate) -> str:
-    row, col = coord
+    row, col = decode(coord)
     return f"{COLUMNS[col]}{row + 1}"
 
 
 def setup_game() -> Tuple[HumanPlayer, ComputerPlayer]:
-    human = HumanPlayer("Admiral")
+    human = HumanPlayer("Admiral", InputReader())
     computer = ComputerPlayer()
 
     human.place_ships(FLEET)
@@ -276,19 +442,46 @@ def play_game() -> None:
         display_status(human, computer)
         if turn % 2 == 0:
             print("\nYour turn!")
-            human.take_turn(computer)
-            if computer.all_ships_sunk():
+            if human.take_turn(computer).game_over:
                 print("\nAll enemy ships have been sunk. You win!")
                 break
         else:
             print("\nEnemy turn...")
-            computer.take_turn(human)
-            if human.all_ships_sunk():
+            if computer.take_turn(human).game_over:
                 print("\nYour fleet has been destroyed. You lose.")
                 break
         turn += 1
 
 
+def simulate(seed: Optional[int] = None) -> Tuple[str, int]:
+    """Play a silent computer-versus-computer game for evaluating the AI.
+
+    Nothing is printed, rendered or read. Returns the winner's name and the
+    number of shots fired in the game.
+    """
+    random.seed(seed)
+    players = (ComputerPlayer("Computer 1"), ComputerPlayer("Computer 2"))
+    for player in players:
+        player.place_ships(FLEET)
+
+    turn = 0
+    while True:
+        attacker, defender = players[turn % 2], players[(turn + 1) % 2]
+        turn += 1
+        if attacker.take_turn(defender, verbose=False).game_over:
+            return attacker.name, turn
+
+
+def run_batch(n_games: int, workers: Optional[int] = None) -> List[Tuple[str, int]]:
+    """Run ``simulate`` for seeds ``0..n_games-1`` across a process pool.
+
+    Each game seeds its own RNG, so results are reproducible per seed; they
+    are returned in completion order rather than seed order.
+    """
+    with mp.Pool(workers) as pool:
+        return list(pool.imap_unordered(simulate, range(n_games), chunksize=64))
+
+
 def main() -> None:
     print("Welcome to Battleship!")
     print("Sink the enemy fleet before yours is sunk.\n")